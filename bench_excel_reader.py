@@ -0,0 +1,87 @@
+"""
+Benchmark: pd.read_excel vs the streaming read-only reader used by hma_expenses.py.
+
+Run from the repository root:
+    python bench_excel_reader.py [repeats]
+
+For each case it reports the best wall time over `repeats` runs and the peak Python
+memory allocated during one run (tracemalloc), for both read paths.
+"""
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+import streamlit.logger
+
+# Importing the app runs its page script in Streamlit's bare mode; keep its warnings out of the report
+streamlit.logger.set_log_level("error")
+import hma_expenses as app
+
+MASTER_FILE = "EXPENSE- MASTER SHEET.xlsx"
+DISTRIBUTION_FILE = "BOOK12.xlsx"
+DISTRIBUTION_COLUMNS = list(range(29, 43))  # Month, Total, projects and LSGB on CORE MANPOWER
+
+
+def _normalized_header_in(columns):
+    wanted = set(columns)
+    return lambda col: " ".join(str(col).split()) in wanted
+
+
+BENCHMARK_CASES = [
+    (
+        "Master sheet, first sheet, all columns",
+        lambda: pd.read_excel(MASTER_FILE),
+        lambda: app.read_excel_columns(MASTER_FILE),
+    ),
+    (
+        "Master sheet, 'MASTER FILE' sheet, all columns",
+        lambda: pd.read_excel(MASTER_FILE, sheet_name="MASTER FILE"),
+        lambda: app.read_excel_columns(MASTER_FILE, sheet_name="MASTER FILE"),
+    ),
+    (
+        "Master sheet, 'JULY 2025 ADMIN EXPENSES', expense columns",
+        lambda: pd.read_excel(MASTER_FILE, sheet_name="JULY 2025 ADMIN EXPENSES", header=1,
+                              usecols=_normalized_header_in(app.EXPENSE_RECORD_COLUMNS)),
+        lambda: app.read_excel_columns(MASTER_FILE, sheet_name="JULY 2025 ADMIN EXPENSES", header_row=1,
+                                       columns=app.EXPENSE_RECORD_COLUMNS),
+    ),
+    (
+        "BOOK12, distribution columns",
+        lambda: pd.read_excel(DISTRIBUTION_FILE, header=None, skiprows=2, usecols=DISTRIBUTION_COLUMNS),
+        lambda: app.read_sheet_rows(DISTRIBUTION_FILE, skip_rows=2, columns=DISTRIBUTION_COLUMNS),
+    ),
+]
+
+
+def measure(read_func, repeats):
+    """Returns (best seconds, peak MiB, rows) for one read path."""
+    best_seconds = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        df = read_func()
+        best_seconds = min(best_seconds, time.perf_counter() - start)
+
+    tracemalloc.start()
+    read_func()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best_seconds, peak_bytes / 2**20, len(df)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    print(f"{'Case':<58} {'Reader':<10} {'Rows':>6} {'Time (s)':>9} {'Peak (MiB)':>11}")
+    for case_name, current_read, streaming_read in BENCHMARK_CASES:
+        current = measure(current_read, repeats)
+        streaming = measure(streaming_read, repeats)
+
+        for reader_name, (seconds, peak_mib, rows) in [("read_excel", current), ("streaming", streaming)]:
+            print(f"{case_name:<58} {reader_name:<10} {rows:>6} {seconds:>9.3f} {peak_mib:>11.1f}")
+        print(f"{'':<58} {'speed-up':<10} {'':>6} {current[0] / streaming[0]:>8.1f}x {current[1] / streaming[1]:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,87 +1,700 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+from openpyxl import load_workbook
+from openpyxl.cell.cell import TYPE_ERROR
+try:
+    # openpyxl internals used to open a single sheet quickly; `open_read_only_sheet` falls back without them
+    from openpyxl.reader.excel import ExcelReader
+    from openpyxl.styles.stylesheet import apply_stylesheet
+    from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+except ImportError:
+    ExcelReader = apply_stylesheet = ReadOnlyWorksheet = None
 import os
+import difflib
 from datetime import datetime
 
 # -----------------------------------------------------------
 # GLOBAL UTILITY FUNCTIONS
 # -----------------------------------------------------------
 
+def normalize_header(header_val):
+    """Normalizes a header cell for matching: case, punctuation and whitespace are ignored."""
+    if pd.isna(header_val):
+        return ""
+    header_text = "".join(ch if ch.isalnum() else " " for ch in str(header_val).casefold())
+    return " ".join(header_text.split())
+
+def read_sheet_rows(file_name, skip_rows=0, max_rows=None, columns=None):
+    """Reads raw rows (no header) from a CSV or the first sheet of an Excel file, keeping column positions as labels."""
+    if file_name.lower().endswith(".csv"):
+        return pd.read_csv(file_name, header=None, skiprows=skip_rows, nrows=max_rows, usecols=columns)
+
+    rows = list(iter_excel_rows(file_name, skip_rows=skip_rows, max_rows=max_rows, column_positions=columns))
+    # Drop the blank rows at the end of the sheet, as pd.read_excel does
+    while rows and all(val is None for val in rows[-1]):
+        rows.pop()
+    df_rows = pd.DataFrame.from_records(rows)
+    if columns is not None:
+        df_rows.columns = columns
+    return df_rows
+
+def infer_month_format(month_values):
+    """
+    Picks the date format that parses most of a sample of the Month column's text values.
+    Returns None if no known format matches any of them.
+    """
+    text_values = month_values[month_values.map(lambda val: isinstance(val, str))]
+    sample = text_values.str.strip().head(MONTH_FORMAT_SAMPLE_SIZE)
+    best_format, best_hits = None, 0
+    for date_format in MONTH_FORMATS:
+        hits = pd.to_datetime(sample, format=date_format, errors="coerce").notna().sum()
+        if hits > best_hits:
+            best_format, best_hits = date_format, hits
+    return best_format
+
+def parse_month_column(month_values, month_format):
+    """
+    Converts a Month column into dropdown strings (e.g. 'June 2025'), one vectorized pass per format.
+    Date cells are used directly; text is parsed with `month_format` first and whatever is left
+    with the other MONTH_FORMATS. Values no format recognises are NaN in the result.
+    """
+    is_date = month_values.map(lambda val: isinstance(val, (datetime, pd.Timestamp)))
+    parsed = pd.Series(pd.NaT, index=month_values.index, dtype="datetime64[ns]")
+    parsed[is_date] = pd.to_datetime(month_values[is_date])
+
+    remaining = month_values[~is_date & month_values.notna()].astype(str).str.strip()
+    remaining = remaining[remaining != ""]
+    other_formats = [date_format for date_format in MONTH_FORMATS if date_format != month_format]
+    for date_format in ([month_format] if month_format else []) + other_formats:
+        if remaining.empty:
+            break
+        parsed_now = pd.to_datetime(remaining, format=date_format, errors="coerce")
+        parsed.update(parsed_now)
+        remaining = remaining[parsed_now.isna()]
+
+    return parsed.dt.strftime("%B %Y")
+
 @st.cache_data
-def load_distribution_data(excel_name, csv_name, project_columns):
+def resolve_distribution_schema(file_name, data_version, project_columns):
+    """
+    Scans the first rows of a distribution file once and resolves where the data lives:
+    the header row, the Month and Total columns and one column per project (fuzzy matched).
+    Failures are returned in the 'error' field instead of being raised, so they are cached and shown.
+    """
+    schema = {
+        "file": file_name, "header_row": None, "month_col": None, "total_col": None,
+        "month_format": None, "project_cols": {}, "fuzzy_matches": {}, "unresolved": [],
+        "notes": [], "error": None
+    }
+    if data_version is None:
+        schema["error"] = "File not found."
+        return schema
+
+    try:
+        df_head = read_sheet_rows(file_name, max_rows=HEADER_SCAN_ROWS)
+    except Exception as e:
+        schema["error"] = f"Could not read the file: {e}"
+        return schema
+
+    # Normalized header -> column position for every scanned row; the header row is the first with a 'month' cell
+    for row_pos in range(len(df_head)):
+        header_index = {}
+        for col_pos, header_val in zip(df_head.columns, df_head.iloc[row_pos]):
+            header_key = normalize_header(header_val)
+            if header_key and header_key not in header_index:
+                header_index[header_key] = col_pos
+        if "month" in header_index:
+            schema["header_row"] = row_pos
+            break
+    else:
+        schema["error"] = f"No 'Month' header found in the first {HEADER_SCAN_ROWS} rows."
+        return schema
+
+    month_col = header_index["month"]
+    schema["month_col"] = month_col
+
+    # The nearest 'Total' header right of Month; the employee table to the left has its own totals
+    header_values = df_head.iloc[schema["header_row"]]
+    total_col = next(
+        (col_pos for col_pos in df_head.columns
+         if col_pos > month_col and "total" in normalize_header(header_values[col_pos]).split()),
+        None
+    )
+    if total_col is not None:
+        schema["total_col"] = total_col
+    elif month_col + 1 in df_head.columns:
+        # Legacy layout: the Total column sits immediately to the right of the Month column
+        schema["total_col"] = month_col + 1
+        schema["notes"].append("No 'Total' header found; using the column to the right of 'Month'.")
+    else:
+        schema["error"] = "No 'Total' column found."
+        return schema
+
+    # Each column is used once: exact matches are claimed first, fuzzy matches only take unclaimed columns
+    claimed_cols = {month_col: "Month", schema["total_col"]: "Total"}
+    fuzzy_pending = []
+    for proj_name in project_columns:
+        proj_col = header_index.get(normalize_header(proj_name))
+        if proj_col is None:
+            fuzzy_pending.append(proj_name)
+        elif proj_col in claimed_cols:
+            schema["unresolved"].append(proj_name)
+            schema["notes"].append(f"'{proj_name}' matches column '{header_values[proj_col]}', already used for '{claimed_cols[proj_col]}'.")
+        else:
+            schema["project_cols"][proj_name] = proj_col
+            claimed_cols[proj_col] = proj_name
+
+    for proj_name in fuzzy_pending:
+        proj_key = normalize_header(proj_name)
+        unclaimed_keys = [key for key in header_index if header_index[key] not in claimed_cols]
+        close_matches = difflib.get_close_matches(proj_key, unclaimed_keys, n=1, cutoff=PROJECT_MATCH_CUTOFF)
+        best_matches = difflib.get_close_matches(proj_key, list(header_index), n=1, cutoff=PROJECT_MATCH_CUTOFF)
+        if best_matches and header_index[best_matches[0]] in claimed_cols:
+            best_col = header_index[best_matches[0]]
+            schema["notes"].append(
+                f"'{proj_name}' is closest to column '{header_values[best_col]}', already used for '{claimed_cols[best_col]}'."
+            )
+        if close_matches:
+            proj_col = header_index[close_matches[0]]
+            schema["project_cols"][proj_name] = proj_col
+            schema["fuzzy_matches"][proj_name] = str(header_values[proj_col])
+            claimed_cols[proj_col] = proj_name
+        else:
+            schema["unresolved"].append(proj_name)
+
+    schema["month_format"] = infer_month_format(df_head.iloc[schema["header_row"] + 1:][month_col])
+    return schema
+
+@st.cache_data
+def load_distribution_data(file_name, data_version, project_columns):
     """
     Loads distribution data from the file, parsing by month.
-    This function is cached to prevent reloading the file on every interaction.
+    Returns (monthly data, schema) where the schema from `resolve_distribution_schema` explains
+    which columns were used and why nothing was loaded, if that is the case.
+    This function is cached by `data_version` (see `get_file_version`) so the file is only re-read after it changes.
+    """
+    schema = resolve_distribution_schema(file_name, data_version, project_columns)
+    if schema["error"]:
+        return {}, schema
+
+    month_col, total_col = schema["month_col"], schema["total_col"]
+    used_cols = sorted({month_col, total_col, *schema["project_cols"].values()})
+    try:
+        df_distribution = read_sheet_rows(file_name, skip_rows=schema["header_row"] + 1, columns=used_cols)
+    except Exception as e:
+        return {}, {**schema, "error": f"Could not read the data rows: {e}"}
+
+    df_distribution = df_distribution.assign(
+        _month=parse_month_column(df_distribution[month_col], schema["month_format"]),
+        _total=pd.to_numeric(df_distribution[total_col], errors="coerce")
+    ).dropna(subset=["_total"])
+
+    unparsed_months = df_distribution.loc[df_distribution["_month"].isna(), month_col].dropna().astype(str).str.strip()
+    unparsed_months = unparsed_months[unparsed_months != ""].unique().tolist()
+    if unparsed_months:
+        schema = {**schema, "notes": schema["notes"] + [
+            f"Rows skipped, month not recognised: {', '.join(unparsed_months)}."
+        ]}
+    df_distribution = df_distribution.dropna(subset=["_month"])
+    # Later rows for the same month overwrite earlier ones
+    df_distribution = df_distribution.drop_duplicates(subset="_month", keep="last")
+
+    df_splits = pd.DataFrame(index=df_distribution.index)
+    for proj_name in project_columns:
+        proj_col = schema["project_cols"].get(proj_name)
+        proj_values = df_distribution[proj_col] if proj_col is not None else 0.0
+        df_splits[proj_name] = pd.to_numeric(proj_values, errors="coerce")
+    df_splits = df_splits.fillna(0.0).astype(float)
+
+    monthly_distribution_data = {
+        month_str: {'total': float(total_value), 'splits': splits}
+        for month_str, total_value, splits in zip(
+            df_distribution["_month"], df_distribution["_total"], df_splits.to_dict("records")
+        )
+    }
+    return monthly_distribution_data, schema
+
+def open_read_only_sheet(file_name, sheet_name=None):
+    """
+    Opens one worksheet of an .xlsx file in openpyxl read-only mode and returns (handle, worksheet).
+    `load_workbook(read_only=True)` still scans every sheet up front to size it, which is most of the
+    load time for the 60+ sheet master workbook, so only the requested sheet (the first one by default)
+    is opened when the installed openpyxl allows it. Close the returned handle when done.
     """
-    df_distribution = None
-    monthly_distribution_data = {}
-    
-    # Attempt to read the file silently
     try:
-        # Priority to CSV if it's explicitly named/available, otherwise use Excel
-        if os.path.exists(csv_name):
-            df_distribution = pd.read_csv(csv_name, header=1)
-        elif os.path.exists(excel_name):
-            df_distribution = pd.read_excel(excel_name, header=1)
+        opened = _open_single_sheet(file_name, sheet_name)
     except Exception:
-        return {} # Return empty data on failure
+        # The openpyxl internals changed; use the public (slower) read-only loader instead
+        workbook = load_workbook(file_name, read_only=True, data_only=True)
+        if sheet_name is None:
+            opened = workbook, workbook.worksheets[0]
+        elif sheet_name in workbook.sheetnames:
+            opened = workbook, workbook[sheet_name]
+        else:
+            workbook.close()
+            opened = None
 
-    if df_distribution is not None and not df_distribution.empty:
-        try:
-            total_col_name = None
-            if 'Month' in df_distribution.columns:
-                month_col_index = df_distribution.columns.get_loc('Month')
-                if month_col_index + 1 < len(df_distribution.columns):
-                    # Assume the Total column is immediately after the Month column
-                    total_col_name = df_distribution.columns[month_col_index + 1]
-
-            if 'Month' in df_distribution.columns and total_col_name:
-                
-                for index, row in df_distribution.iterrows():
-                    month_date = row['Month']
-                    total_value = row.get(total_col_name)
+    if opened is None:
+        raise ValueError(f"Worksheet named '{sheet_name}' not found in {file_name}")
 
-                    # Helper function to standardize month string (defined outside this cache)
-                    month_str = format_month_for_match(month_date)
-                    
-                    if month_str and pd.notna(total_value):
-                        total_value = float(total_value)
-                        
-                        project_splits = {}
-                        for proj_name in project_columns:
-                            proj_amount = 0.0
-                            
-                            # Find the column in the DataFrame that matches the project name
-                            found_col = next((col for col in df_distribution.columns if str(col).strip() == proj_name.strip()), None)
-                                
-                            if found_col:
-                                val = row.get(found_col)
-                                proj_amount = float(val) if pd.notna(val) else 0.0
-
-                            project_splits[proj_name] = proj_amount
-                        
-                        monthly_distribution_data[month_str] = {
-                            'total': total_value,
-                            'splits': project_splits
-                        }
-                        
-        except Exception:
-            return {}
-            
-    return monthly_distribution_data
+    handle, worksheet = opened
+    # The stored sheet dimensions can be stale; read every row and cell present instead, as pandas does
+    worksheet.reset_dimensions()
+    return handle, worksheet
 
-def format_month_for_match(date_val):
-    """Converts various date formats (from Excel) into the Streamlit dropdown format (e.g., 'June 2025')."""
-    if pd.notna(date_val):
-        try:
-            # Attempt to parse it as a date and format to "Month YYYY"
-            return pd.to_datetime(date_val).strftime("%B %Y")
-        except:
-            # If it's not a date, return the string representation
-            return str(date_val).strip()
+def _open_single_sheet(file_name, sheet_name):
+    """
+    Reads only the shared strings, styles and one sheet of a workbook through openpyxl's ExcelReader.
+    Returns (archive, worksheet), or None if there is no such sheet.
+    """
+    reader = ExcelReader(file_name, read_only=True, data_only=True)
+    try:
+        reader.read_manifest()
+        reader.read_strings()
+        reader.read_workbook()
+        # Number formats are needed to return date cells as datetimes
+        apply_stylesheet(reader.archive, reader.wb)
+
+        for sheet, rel in reader.parser.find_sheets():
+            if rel.target not in reader.valid_files or "chartsheet" in rel.Type:
+                continue
+            if sheet_name is None or sheet.name == sheet_name:
+                return reader.archive, ReadOnlyWorksheet(reader.wb, sheet.name, rel.target, reader.shared_strings)
+    except Exception:
+        reader.archive.close()
+        raise
+
+    reader.archive.close()
     return None
 
+def iter_excel_rows(file_name, sheet_name=None, skip_rows=0, max_rows=None, column_positions=None):
+    """
+    Streams cell values row by row from one worksheet, optionally keeping only `column_positions` (0-based).
+    Blank cells are None and error cells (e.g. #DIV/0!) are NaN, as `pd.read_excel` reads them.
+    """
+    handle, worksheet = open_read_only_sheet(file_name, sheet_name)
+    try:
+        max_row = skip_rows + max_rows if max_rows is not None else None
+        for row in worksheet.iter_rows(min_row=skip_rows + 1, max_row=max_row):
+            # Cells rather than values, so error cells can be told apart from text that looks like one
+            row = tuple(np.nan if cell.data_type == TYPE_ERROR else cell.value for cell in row)
+            if column_positions is not None:
+                row = tuple(row[pos] if pos < len(row) else None for pos in column_positions)
+            yield row
+    finally:
+        handle.close()
+
+def _dedupe_headers(headers):
+    """Names blank headers 'Unnamed: <position>' and suffixes repeats with '.1', '.2', ... like pandas does."""
+    seen = {}
+    names = []
+    for pos, header_val in enumerate(headers):
+        header_val = _excel_cell_value(header_val)
+        name = " ".join(str(header_val).split()) if pd.notna(header_val) else f"Unnamed: {pos}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+def _excel_cell_value(cell_val):
+    """Converts a raw cell value the way `pd.read_excel` does: blanks to NaN, whole-number floats to int."""
+    if cell_val is None:
+        return np.nan
+    if isinstance(cell_val, float) and cell_val.is_integer():
+        return int(cell_val)
+    return cell_val
+
+def iter_excel_chunks(file_name, sheet_name=None, header_row=0, columns=None, chunk_size=None):
+    """
+    Streams a worksheet as DataFrames of up to `chunk_size` rows without loading the rest of the workbook.
+    Header names are whitespace-normalised; if `columns` is given only those headers are kept
+    (missing ones are skipped). As with `pd.read_excel`, blank rows after the last value are dropped
+    and values past the last header get 'Unnamed: <position>' columns.
+    """
+    chunk_size = chunk_size or EXCEL_CHUNK_SIZE
+    rows = iter_excel_rows(file_name, sheet_name, skip_rows=header_row)
+    try:
+        header_values = list(next(rows, ()))
+        while header_values and header_values[-1] is None:
+            header_values.pop()
+
+        header_names = _dedupe_headers(header_values)
+        if columns is None:
+            used_positions = None
+            column_names = header_names
+        else:
+            wanted_names = set(columns)
+            used_positions = [pos for pos, name in enumerate(header_names) if name in wanted_names]
+            column_names = [header_names[pos] for pos in used_positions]
+
+        chunk = []
+        chunk_width = len(column_names)
+        blank_rows = 0
+        for row in rows:
+            if used_positions is not None:
+                row = tuple(row[pos] if pos < len(row) else None for pos in used_positions)
+
+            # Blank rows are only kept once a later row has values
+            row_width = len(row)
+            while row_width and row[row_width - 1] is None:
+                row_width -= 1
+            if not row_width:
+                blank_rows += 1
+                continue
+
+            chunk.extend([[]] * blank_rows)
+            blank_rows = 0
+            chunk.append([_excel_cell_value(val) for val in row[:row_width]])
+            if row_width > chunk_width:
+                # Values past the last header: name the extra columns once, when the sheet gets wider
+                chunk_width = row_width
+                column_names = _dedupe_headers(header_values + [None] * (chunk_width - len(header_values)))
+
+            if len(chunk) >= chunk_size:
+                yield _excel_chunk_frame(chunk, column_names)
+                chunk = []
+        if chunk:
+            yield _excel_chunk_frame(chunk, column_names)
+    finally:
+        rows.close()
+
+def _excel_chunk_frame(chunk, column_names):
+    """Builds one chunk's DataFrame, padding short rows with NaN."""
+    padded_rows = [row + [np.nan] * (len(column_names) - len(row)) for row in chunk]
+    return pd.DataFrame.from_records(padded_rows, columns=column_names)
+
+def read_excel_columns(file_name, sheet_name=None, header_row=0, columns=None):
+    """Reads one worksheet (or only the `columns` it needs) into a DataFrame using `iter_excel_chunks`."""
+    chunks = list(iter_excel_chunks(file_name, sheet_name, header_row, columns))
+    if not chunks:
+        return pd.DataFrame()
+    return pd.concat(chunks, ignore_index=True).infer_objects()
+
+def get_file_version(file_name):
+    """
+    Returns a (modified time, size) tuple for a data file, or None if it does not exist.
+    Passed to the cached loaders below so they re-read a file only after it has changed.
+    """
+    if os.path.exists(file_name):
+        file_stat = os.stat(file_name)
+        return (file_stat.st_mtime_ns, file_stat.st_size)
+    return None
+
+@st.cache_data
+def list_sheet_names(file_name, data_version):
+    """Returns the worksheet names of an output workbook, in workbook order (empty if it does not exist)."""
+    if data_version is None:
+        return []
+
+    try:
+        reader = ExcelReader(file_name, read_only=True, data_only=True)
+        try:
+            reader.read_manifest()
+            reader.read_workbook()
+            return [
+                sheet.name for sheet, rel in reader.parser.find_sheets()
+                if rel.target in reader.valid_files and "chartsheet" not in rel.Type
+            ]
+        finally:
+            reader.archive.close()
+    except Exception:
+        # The openpyxl internals changed; see `open_read_only_sheet`
+        workbook = load_workbook(file_name, read_only=True, data_only=True)
+        try:
+            return list(workbook.sheetnames)
+        finally:
+            workbook.close()
+
+@st.cache_data
+def load_output_frame(file_name, data_version, columns=None, sheet_name=None):
+    """
+    Loads one sheet (the first by default) of the app's output workbooks, or only the given `columns`, into a DataFrame.
+    Column names are whitespace-normalised (e.g. 'Actual \\nexpense' -> 'Actual expense').
+    """
+    if data_version is None:
+        return pd.DataFrame()
+
+    return read_excel_columns(file_name, sheet_name=sheet_name, columns=columns)
+
+def _first_present_column(df, candidates):
+    """Returns the first column name from `candidates` that exists in `df`, or None."""
+    return next((col for col in candidates if col in df.columns), None)
+
+def standardize_expense_records(source, df_source):
+    """
+    Maps an HR or CSR expense frame onto common column names:
+    Source, Vendor, Item, Month, Annual commitment, Monthly Average, Actual, Payment frequency,
+    Date Saved + project columns.
+    """
+    if df_source.empty or "Vendor" not in df_source.columns:
+        return pd.DataFrame()
+
+    source_columns = EXPENSE_SOURCE_COLUMNS[source]
+    df_std = pd.DataFrame({"Source": source, "Vendor": df_source["Vendor"]})
+    item_col = _first_present_column(df_source, source_columns["Item"])
+    df_std["Item"] = df_source[item_col] if item_col else ""
+
+    for std_col in ["Annual commitment", "Monthly Average", "Actual"]:
+        src_col = _first_present_column(df_source, source_columns[std_col])
+        df_std[std_col] = pd.to_numeric(df_source[src_col], errors="coerce") if src_col else np.nan
+    frequency_col = _first_present_column(df_source, source_columns["Payment frequency"])
+    df_std["Payment frequency"] = df_source[frequency_col] if frequency_col else np.nan
+
+    # CSR entries carry a 'Month' column; HR entries only have the save timestamp
+    if "Date Saved" in df_source.columns:
+        date_saved = pd.to_datetime(df_source["Date Saved"], errors="coerce")
+    else:
+        date_saved = pd.Series(pd.NaT, index=df_source.index)
+    df_std["Date Saved"] = date_saved
+    if "Month" in df_source.columns:
+        df_std["Month"] = df_source["Month"].astype(str).str.strip()
+    else:
+        df_std["Month"] = date_saved.dt.strftime("%B %Y")
+
+    for proj_name in PROJECT_COLUMNS:
+        proj_values = df_source[proj_name] if proj_name in df_source.columns else 0.0
+        df_std[proj_name] = pd.to_numeric(proj_values, errors="coerce")
+    lsgb_col = _first_present_column(df_source, ["LSGB (Balance)", "LSGB"])
+    df_std["LSGB"] = pd.to_numeric(df_source[lsgb_col], errors="coerce") if lsgb_col else 0.0
+
+    return df_std.dropna(subset=["Vendor"])
+
+@st.cache_data
+def load_expense_records(hr_file, hr_version, csr_file, csr_version):
+    """Combines the HR and CSR expense outputs into one standardized frame (see `standardize_expense_records`)."""
+    frames = [
+        standardize_expense_records("HR", load_output_frame(hr_file, hr_version, EXPENSE_RECORD_COLUMNS)),
+        standardize_expense_records("CSR", load_output_frame(csr_file, csr_version, EXPENSE_RECORD_COLUMNS)),
+    ]
+    frames = [df for df in frames if not df.empty]
+
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+def downsample_series(df, x_col, y_col, max_points):
+    """
+    Reduces a long series to at most `max_points` rows by keeping the min and max of
+    each bucket of consecutive points, so peaks and dips are still visible in the chart.
+    """
+    df = df.dropna(subset=[y_col]).reset_index(drop=True)
+    if len(df) <= max_points:
+        return df
+
+    buckets = np.arange(len(df)) * (max_points // 2) // len(df)
+    grouped = df.groupby(buckets)[y_col]
+    keep_rows = np.union1d(grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy())
+    return df.loc[keep_rows, [x_col, y_col]]
+
+@st.cache_data
+def build_dashboard_figures(hr_file, hr_version, csr_file, csr_version, max_points):
+    """
+    Pre-aggregates the expense records and returns the dashboard figures as plotly JSON.
+    Cached by data version, so the group-bys and figure building only run after a file changes.
+    """
+    df_records = load_expense_records(hr_file, hr_version, csr_file, csr_version)
+    if df_records.empty:
+        return {}
+
+    figures = {}
+
+    # --- Actual vs Monthly Average vs Annual commitment per vendor ---
+    # Commitment and average are per vendor/item, so take them once per item before summing per vendor
+    df_items = df_records.groupby(["Vendor", "Item"], sort=False).agg(
+        {"Actual": "sum", "Monthly Average": "mean", "Annual commitment": "max"}
+    )
+    df_vendor = df_items.groupby(level="Vendor").sum().sort_values("Actual", ascending=False)
+
+    fig_vendor = go.Figure()
+    for measure in ["Actual", "Monthly Average", "Annual commitment"]:
+        fig_vendor.add_trace(go.Bar(name=measure, x=df_vendor.index.astype(str), y=df_vendor[measure]))
+    fig_vendor.update_layout(barmode="group", title="Spend by Vendor", yaxis_title="Amount (₹)")
+    figures["vendor"] = fig_vendor.to_json()
+
+    # --- Per-project distribution over MONTHS ---
+    distribution_cols = PROJECT_COLUMNS + ["LSGB"]
+    df_months = (
+        df_records.groupby("Month")[distribution_cols].sum()
+        .reindex(MONTHS, fill_value=0.0)
+    )
+
+    fig_projects = go.Figure()
+    for proj_name in distribution_cols:
+        if df_months[proj_name].any():
+            fig_projects.add_trace(go.Bar(name=proj_name, x=df_months.index, y=df_months[proj_name]))
+    fig_projects.update_layout(barmode="stack", title="Project Distribution by Month", yaxis_title="Amount (₹)")
+    figures["projects"] = fig_projects.to_json()
+
+    # --- Cumulative actual spend over time (downsampled for long histories) ---
+    # CSR entries have no save timestamp, so they are dated to the first day of their Month
+    month_start = pd.to_datetime(df_records["Month"], format="%B %Y", errors="coerce")
+    df_timeline = df_records.assign(**{"Spend Date": df_records["Date Saved"].fillna(month_start)})
+    df_timeline = df_timeline.dropna(subset=["Spend Date"]).sort_values("Spend Date", kind="stable")
+    if not df_timeline.empty:
+        df_timeline = df_timeline.assign(**{"Cumulative Actual": df_timeline["Actual"].fillna(0.0).cumsum()})
+        df_timeline = downsample_series(df_timeline, "Spend Date", "Cumulative Actual", max_points)
+
+        fig_timeline = go.Figure(go.Scatter(x=df_timeline["Spend Date"], y=df_timeline["Cumulative Actual"], mode="lines"))
+        fig_timeline.update_layout(title="Cumulative Actual Spend", yaxis_title="Amount (₹)")
+        figures["timeline"] = fig_timeline.to_json()
+
+    return figures
+
+@st.cache_data(max_entries=50)  # one entry per filter/sort combination typed
+def query_output_records(file_name, data_version, sheet_name, filter_col, filter_text, sort_col, sort_ascending):
+    """
+    Filters and sorts one sheet of an output workbook on the server and returns the matching row positions.
+    Only the positions are cached per query; the page slice is taken from the cached frame by the caller.
+    """
+    df = load_output_frame(file_name, data_version, sheet_name=sheet_name)
+    mask = np.ones(len(df), dtype=bool)
+
+    if filter_text:
+        search_cols = df.columns if filter_col is None else [filter_col]
+        col_mask = np.zeros(len(df), dtype=bool)
+        for col in search_cols:
+            col_mask |= df[col].astype(str).str.contains(filter_text, case=False, regex=False).to_numpy()
+        mask &= col_mask
+
+    positions = np.flatnonzero(mask)
+
+    if sort_col is not None and len(positions):
+        sort_values = df[sort_col].iloc[positions]
+        direction = 1 if sort_ascending else -1
+        sort_keys = [key * direction for key in _record_sort_keys(sort_values)]
+        # lexsort is stable and its last key is the primary one: blanks always go last, ties keep file order
+        order = np.lexsort(sort_keys + [sort_values.isna().to_numpy()])
+        positions = positions[order]
+
+    return positions
+
+def _record_sort_keys(sort_values):
+    """
+    Returns numeric sort keys for a column, least significant first.
+    Mixed text/number columns from Excel sort numbers by value first, then text alphabetically.
+    """
+    if pd.api.types.is_numeric_dtype(sort_values) or pd.api.types.is_datetime64_any_dtype(sort_values):
+        return [sort_values.rank(method="dense").fillna(0.0).to_numpy()]
+
+    numeric_values = pd.to_numeric(sort_values, errors="coerce")
+    is_text = numeric_values.isna() & sort_values.notna()
+    text_rank = np.zeros(len(sort_values))
+    _, text_rank[is_text.to_numpy()] = np.unique(sort_values[is_text].astype(str).to_numpy(dtype=object), return_inverse=True)
+    return [
+        text_rank,
+        numeric_values.rank(method="dense").fillna(0.0).to_numpy(),
+        is_text.to_numpy(dtype=float),
+    ]
+
+def aggregate_reconciliation_totals(df_records):
+    """
+    Collapses standardized expense records into per vendor/item/month totals.
+    Every column is additive (or a max, or the latest value), so totals for new entries can be merged into existing ones.
+    """
+    return df_records.groupby(RECONCILIATION_KEYS, sort=False, dropna=False).agg(**{
+        "Actual": ("Actual", "sum"),
+        "Monthly Average Sum": ("Monthly Average", "sum"),
+        "Annual commitment": ("Annual commitment", "max"),
+        "Payment frequency": ("Payment frequency", "last"),
+        "Entries": ("Vendor", "size"),
+    })
+
+def merge_reconciliation_totals(df_totals, df_new_totals):
+    """Merges two sets of per vendor/item/month totals; costs O(groups), not O(entries)."""
+    return pd.concat([df_totals, df_new_totals]).groupby(level=RECONCILIATION_KEYS, sort=False, dropna=False).agg({
+        "Actual": "sum",
+        "Monthly Average Sum": "sum",
+        "Annual commitment": "max",
+        "Payment frequency": "last",
+        "Entries": "sum",
+    })
+
+@st.cache_resource
+def get_reconciliation_store():
+    """
+    Process-wide store of reconciliation totals per output file:
+    {file_name: {'version': file version the totals match, 'totals': DataFrame}}.
+    """
+    return {}
+
+def get_reconciliation_totals(source, file_name):
+    """
+    Returns the per vendor/item/month totals for one output file.
+    The file is only re-read when it changed outside the app; saves made here are folded in by
+    `update_reconciliation_totals`.
+    """
+    reconciliation_store = get_reconciliation_store()
+    data_version = get_file_version(file_name)
+    stored = reconciliation_store.get(file_name)
+
+    if stored is None or stored["version"] != data_version:
+        df_records = standardize_expense_records(source, load_output_frame(file_name, data_version, EXPENSE_RECORD_COLUMNS))
+        if df_records.empty:
+            return pd.DataFrame()
+        stored = {"version": data_version, "totals": aggregate_reconciliation_totals(df_records)}
+        reconciliation_store[file_name] = stored
+
+    return stored["totals"]
+
+def update_reconciliation_totals(source, file_name, df_new_entries, previous_version):
+    """
+    Folds newly saved entries into the stored totals for `file_name`.
+    `previous_version` is the file version before the save; if the stored totals don't match it,
+    they are dropped and rebuilt from the file on the next report.
+    """
+    reconciliation_store = get_reconciliation_store()
+    stored = reconciliation_store.get(file_name)
+    if stored is None:
+        return
+
+    df_new_records = standardize_expense_records(source, df_new_entries)
+    if stored["version"] != previous_version or df_new_records.empty:
+        reconciliation_store.pop(file_name, None)
+        return
+
+    stored["totals"] = merge_reconciliation_totals(stored["totals"], aggregate_reconciliation_totals(df_new_records))
+    stored["version"] = get_file_version(file_name)
+
+def build_reconciliation_report(df_totals):
+    """
+    Computes budget vs actual per vendor/item from the monthly totals, counting every entry as one payment:
+    variance against the budget for the payments recorded, burn rate against the annual commitment
+    and the overrun projected from the average payment and the payment frequency.
+    Budgeting per entry rather than per month keeps HR bills saved together (their Month is the save date)
+    from counting as a single month of budget.
+    """
+    df_report = df_totals.groupby(level=["Source", "Vendor", "Item"], sort=False, dropna=False).agg(**{
+        "Months Recorded": ("Entries", "size"),
+        "Entries": ("Entries", "sum"),
+        "Annual commitment": ("Annual commitment", "max"),
+        "Payment frequency": ("Payment frequency", "last"),
+        "Monthly Average Sum": ("Monthly Average Sum", "sum"),
+        "Actual": ("Actual", "sum"),
+    })
+
+    # Items without a known frequency are assumed to be paid monthly
+    payments_per_year = df_report["Payment frequency"].map(PAYMENTS_PER_YEAR).fillna(12)
+    # A payment covers 12 / payments-per-year months of the monthly average (e.g. 3 for Quarterly)
+    budget_to_date = df_report.pop("Monthly Average Sum") * 12 / payments_per_year
+    df_report.insert(df_report.columns.get_loc("Actual"), "Budget to Date", budget_to_date)
+
+    budget_to_date = df_report["Budget to Date"].replace(0.0, np.nan)
+    annual_commitment = df_report["Annual commitment"].replace(0.0, np.nan)
+
+    df_report["Variance"] = df_report["Actual"] - df_report["Budget to Date"]
+    df_report["Variance %"] = df_report["Variance"] / budget_to_date * 100
+    df_report["Burn Rate %"] = df_report["Actual"] / annual_commitment * 100
+    df_report["Projected Annual"] = df_report["Actual"] / df_report["Entries"] * payments_per_year
+    df_report["Projected Overrun"] = df_report["Projected Annual"] - annual_commitment
+
+    return df_report.reset_index().sort_values("Projected Overrun", ascending=False, ignore_index=True)
+
 # -----------------------------------------------------------
 # HARDCODED DATA AND CONFIGURATION
 # -----------------------------------------------------------
@@ -108,6 +721,65 @@ MONTHS = [
     "January 2026", "February 2026", "March 2026"
 ]
 
+# --- Distribution file header resolution ---
+HEADER_SCAN_ROWS = 20           # rows scanned for the header containing 'Month'
+PROJECT_MATCH_CUTOFF = 0.85     # minimum similarity for a fuzzy project header match
+MONTH_FORMAT_SAMPLE_SIZE = 50   # Month cells sampled to infer the date format
+MONTH_FORMATS = [
+    "%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%B %Y", "%b %Y", "%B-%y", "%b-%y", "%b-%Y",
+    "%m/%Y", "%d-%m-%Y", "%d/%m/%Y", "%m/%d/%Y"
+]
+
+# --- Output Files (written by the entry pages, read by the dashboard) ---
+HR_OUTPUT_FILE = "EXPENSE- MASTER SHEET.xlsx"
+CSR_OUTPUT_FILE = "hma_csr_admin_expenses_output.xlsx"
+HR_REVENUE_OUTPUT_FILE = "hma_hr_revenue_output.xlsx"
+PROJECT_OUTPUT_FILE = "hma_project_expenses_output.xlsx"
+
+# --- Output files listed in the Records Browser (label -> file) ---
+RECORD_SOURCES = {
+    "HR Expenses (Master Sheet)": HR_OUTPUT_FILE,
+    "CSR Admin Expenses": CSR_OUTPUT_FILE,
+    "HR Revenue (Internships)": HR_REVENUE_OUTPUT_FILE,
+    "Project Expenses Calculator": PROJECT_OUTPUT_FILE,
+}
+
+RECORDS_PAGE_SIZES = [25, 50, 100, 250]
+
+# --- Column names of each expense output, mapped onto the standardized record columns ---
+EXPENSE_SOURCE_COLUMNS = {
+    "HR": {
+        "Item": ["Service"],
+        "Annual commitment": ["Annual commitment"],
+        "Monthly Average": ["Monthly Average"],
+        "Actual": ["Actual expense", "Actual"],
+        "Payment frequency": ["Payment frequency"],
+    },
+    "CSR": {
+        "Item": ["Expense Type"],
+        "Annual commitment": ["Annual Commitment (₹)"],
+        "Monthly Average": ["Monthly Average (₹)"],
+        "Actual": ["Actual (₹)"],
+        "Payment frequency": ["Payment Frequency"],
+    },
+}
+
+# --- Every column `standardize_expense_records` may use; the loaders read only these ---
+EXPENSE_RECORD_COLUMNS = sorted(
+    {"Vendor", "Month", "Date Saved", "LSGB", "LSGB (Balance)"}
+    | {col for source_columns in EXPENSE_SOURCE_COLUMNS.values() for candidates in source_columns.values() for col in candidates}
+    | set(PROJECT_COLUMNS)
+)
+
+# --- Rows per DataFrame chunk when streaming worksheets ---
+EXCEL_CHUNK_SIZE = 5000
+
+# --- Budget reconciliation is totalled per source/vendor/item/month ---
+RECONCILIATION_KEYS = ["Source", "Vendor", "Item", "Month"]
+
+# --- Maximum points plotted per line series on the dashboard ---
+DASHBOARD_MAX_POINTS = 1000
+
 # --- Hardcoded Lists for Page 2 (Core Team) ---
 core_team_names = [
     "Gayatri Vijay L", "Vishnu", "Anakha Joy", "Jeena Raju", "Sujitha S", 
@@ -160,6 +832,9 @@ CSR_PAYMENT_FREQUENCY = [
     "Half Yearly"
 ]
 
+# --- Payments per year for each frequency, used to project annual spend ---
+PAYMENTS_PER_YEAR = {"Monthly": 12, "Quarterly": 4, "Half Yearly": 2}
+
 # --- Hardcoded Lists for Page 3 (HR Expenses) ---
 HR_VENDOR_OPTIONS = [
     "Dr Anandam", "BSNL", "KSEB", "KWA", "Subramania Industries", "Imprest",
@@ -237,7 +912,10 @@ with st.sidebar:
          "HMA CORE TEAM",
          "HMA CSR ADMIN EXPENSES", 
          "HR EXPENSES",
-         "HMA HR REVENUE"],
+         "HMA HR REVENUE",
+         "HMA ANALYTICS DASHBOARD",
+         "RECORDS BROWSER",
+         "BUDGET RECONCILIATION"],
         format_func=lambda x: f"**{x}**"
     )
 
@@ -318,8 +996,8 @@ if menu == "HMA PROJECT EXPENSES CALCULATOR":
                     "Project Direct Expenses (85%)": [direct_exp]
                 })
 
-                df_output.to_excel("hma_project_expenses_output.xlsx", index=False)
-                st.success("Excel File Saved as **hma_project_expenses_output.xlsx**")
+                df_output.to_excel(PROJECT_OUTPUT_FILE, index=False)
+                st.success(f"Excel File Saved as **{PROJECT_OUTPUT_FILE}**")
 
 
 # -----------------------------------------------------------
@@ -337,8 +1015,25 @@ elif menu == "HMA CORE TEAM":
     FILE_NAME_EXCEL = "BOOK12.xlsx"
     FILE_NAME_CSV = "BOOK12.xlsx - CORE MANPOWER.csv" 
 
-    # Load data from file (cached)
-    monthly_distribution_data = load_distribution_data(FILE_NAME_EXCEL, FILE_NAME_CSV, PROJECT_COLUMNS)
+    # Priority to CSV if it's explicitly named/available, otherwise use Excel
+    distribution_file = FILE_NAME_CSV if os.path.exists(FILE_NAME_CSV) else FILE_NAME_EXCEL
+
+    # Load data from file (cached until the file changes)
+    monthly_distribution_data, distribution_schema = load_distribution_data(
+        distribution_file, get_file_version(distribution_file), PROJECT_COLUMNS
+    )
+
+    # Report header resolution problems instead of silently falling back to zeros
+    if distribution_schema["error"]:
+        st.warning(f"Could not load distribution data from **{distribution_schema['file']}**: {distribution_schema['error']}")
+    elif distribution_schema["unresolved"]:
+        st.warning(f"No matching column found in **{distribution_schema['file']}** for: {', '.join(distribution_schema['unresolved'])}. These projects are shown as ₹0.00.")
+    if distribution_schema["fuzzy_matches"] or distribution_schema["notes"]:
+        with st.expander("Column matching details"):
+            for proj_name, header_text in distribution_schema["fuzzy_matches"].items():
+                st.markdown(f"- **{proj_name}** matched to column **{header_text}**")
+            for note in distribution_schema["notes"]:
+                st.markdown(f"- {note}")
     
     # GUARANTEE FULL RANGE: Use the hardcoded MONTHS list for the dropdown options.
     available_months = MONTHS
@@ -444,7 +1139,7 @@ elif menu == "HR EXPENSES":
     st.header("💼 HR Expenses Entry Form")
     st.markdown("---")
 
-    OUTPUT_FILE_HR = "EXPENSE- MASTER SHEET.xlsx"
+    OUTPUT_FILE_HR = HR_OUTPUT_FILE
 
     with st.form("hr_expenses_form", clear_on_submit=True):
         st.subheader("Vendor, Service, and Payment Details")
@@ -555,6 +1250,7 @@ elif menu == "HR EXPENSES":
 
                 # Handle file reading/appending
                 try:
+                    previous_version = get_file_version(OUTPUT_FILE_HR)
                     if os.path.exists(OUTPUT_FILE_HR):
                         existing_df = pd.read_excel(OUTPUT_FILE_HR)
                         # Concatenate new data, ensuring column alignment
@@ -563,6 +1259,7 @@ elif menu == "HR EXPENSES":
                         updated_df = df_output_hr
                         
                     updated_df.to_excel(OUTPUT_FILE_HR, index=False)
+                    update_reconciliation_totals("HR", OUTPUT_FILE_HR, df_output_hr, previous_version)
                     st.success(f"HR Expense details for **{final_vendor}** saved successfully and updated in **{OUTPUT_FILE_HR}**.")
                     
                     # Optional: Display the saved entry
@@ -696,10 +1393,11 @@ elif menu == "HMA CSR ADMIN EXPENSES":
             
             df_output_csr = pd.DataFrame([output_data])
             
-            OUTPUT_FILE = "hma_csr_admin_expenses_output.xlsx"
+            OUTPUT_FILE = CSR_OUTPUT_FILE
             
             # Handle file reading/appending
             try:
+                previous_version = get_file_version(OUTPUT_FILE)
                 if os.path.exists(OUTPUT_FILE):
                     existing_df = pd.read_excel(OUTPUT_FILE)
                     updated_df = pd.concat([existing_df, df_output_csr], ignore_index=True)
@@ -707,6 +1405,7 @@ elif menu == "HMA CSR ADMIN EXPENSES":
                     updated_df = df_output_csr
                     
                 updated_df.to_excel(OUTPUT_FILE, index=False)
+                update_reconciliation_totals("CSR", OUTPUT_FILE, df_output_csr, previous_version)
                 st.success(f"CSR Expense details saved successfully to **{OUTPUT_FILE}**.")
             except Exception as e:
                 st.error(f"An error occurred while saving the data: {e}")
@@ -745,7 +1444,7 @@ elif menu == "HMA HR REVENUE":
                     "Date Saved": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 }])
                 
-                OUTPUT_FILE = "hma_hr_revenue_output.xlsx"
+                OUTPUT_FILE = HR_REVENUE_OUTPUT_FILE
                 
                 # 3. Handle file reading/appending
                 try:
@@ -769,3 +1468,168 @@ elif menu == "HMA HR REVENUE":
                     
                 except Exception as e:
                     st.error(f"An error occurred while saving the data: {e}")
+
+# -----------------------------------------------------------
+# PAGE 6 — HMA ANALYTICS DASHBOARD
+# -----------------------------------------------------------
+elif menu == "HMA ANALYTICS DASHBOARD":
+    st.header("📈 HMA ANALYTICS DASHBOARD")
+    st.markdown("---")
+
+    # Figures are rebuilt only when one of the output files changes (cached by file version)
+    try:
+        dashboard_figures = build_dashboard_figures(
+            HR_OUTPUT_FILE, get_file_version(HR_OUTPUT_FILE),
+            CSR_OUTPUT_FILE, get_file_version(CSR_OUTPUT_FILE),
+            DASHBOARD_MAX_POINTS
+        )
+    except Exception as e:
+        dashboard_figures = {}
+        st.error(f"An error occurred while building the dashboard: {e}")
+
+    if not dashboard_figures:
+        st.info("No expense entries found yet. Save entries on the **HR EXPENSES** or **HMA CSR ADMIN EXPENSES** pages to populate the dashboard.")
+    else:
+        st.subheader("🏷 Spend by Vendor")
+        st.plotly_chart(pio.from_json(dashboard_figures["vendor"]))
+
+        st.subheader("📊 Project Distribution by Month")
+        st.plotly_chart(pio.from_json(dashboard_figures["projects"]))
+
+        if "timeline" in dashboard_figures:
+            st.subheader("🕒 Cumulative Actual Spend")
+            st.caption("HR entries are plotted on the date they were saved; CSR entries on the first day of their month.")
+            st.plotly_chart(pio.from_json(dashboard_figures["timeline"]))
+
+# -----------------------------------------------------------
+# PAGE 7 — RECORDS BROWSER
+# -----------------------------------------------------------
+elif menu == "RECORDS BROWSER":
+    st.header("🗂 RECORDS BROWSER")
+    st.markdown("---")
+
+    source_label = st.selectbox("Records", list(RECORD_SOURCES.keys()), key="records_source")
+    records_file = RECORD_SOURCES[source_label]
+    records_version = get_file_version(records_file)
+
+    try:
+        sheet_names = list_sheet_names(records_file, records_version)
+    except Exception as e:
+        sheet_names = []
+        st.error(f"An error occurred while reading **{records_file}**: {e}")
+
+    # The master sheet keeps its history across many sheets; other outputs have a single sheet
+    records_sheet = None
+    if len(sheet_names) > 1:
+        records_sheet = st.selectbox("Sheet", sheet_names, key=f"records_sheet_{records_file}")
+    records_key = f"{records_file}_{records_sheet}"
+    records_label = f"{records_file} (sheet {records_sheet})" if records_sheet else records_file
+
+    try:
+        df_records = load_output_frame(records_file, records_version, sheet_name=records_sheet) if sheet_names else pd.DataFrame()
+    except Exception as e:
+        df_records = pd.DataFrame()
+        st.error(f"An error occurred while reading **{records_file}**: {e}")
+
+    if df_records.empty:
+        st.info(f"No records found in **{records_label}** yet.")
+    else:
+        # --- Step 1: Filter and Sort ---
+        st.subheader("🔍 Filter and Sort")
+        col1, col2 = st.columns(2)
+        with col1:
+            filter_col = st.selectbox("Search In", ["(All Columns)"] + list(df_records.columns), key=f"records_filter_col_{records_key}")
+            filter_text = st.text_input("Contains", key=f"records_filter_text_{records_key}").strip()
+        with col2:
+            sort_col = st.selectbox("Sort By", ["(File Order)"] + list(df_records.columns), key=f"records_sort_col_{records_key}")
+            sort_order = st.radio("Order", ["Ascending", "Descending"], horizontal=True, key=f"records_sort_order_{records_key}")
+
+        records_query = (
+            None if filter_col == "(All Columns)" else filter_col,
+            filter_text,
+            None if sort_col == "(File Order)" else sort_col,
+            sort_order == "Ascending"
+        )
+        matching_rows = query_output_records(records_file, records_version, records_sheet, *records_query)
+
+        st.markdown("---")
+
+        # --- Step 2: Pagination (only the current page is sent to the browser) ---
+        col3, col4 = st.columns(2)
+        with col3:
+            page_size = st.selectbox("Rows per Page", RECORDS_PAGE_SIZES, key="records_page_size")
+
+        total_pages = max(1, -(-len(matching_rows) // page_size))
+        page_key = f"records_page_{records_key}"
+        # A new filter or sort starts again from the first page
+        query_key = f"records_query_{records_key}"
+        if st.session_state.get(query_key) != records_query:
+            st.session_state[query_key] = records_query
+            st.session_state[page_key] = 1
+        elif st.session_state.get(page_key, 1) > total_pages:
+            st.session_state[page_key] = total_pages
+
+        with col4:
+            page_number = st.number_input(f"Page (of {total_pages})", min_value=1, max_value=total_pages, step=1, key=page_key)
+
+        page_start = (page_number - 1) * page_size
+        page_rows = matching_rows[page_start:page_start + page_size]
+
+        if len(matching_rows) == 0:
+            st.warning("No records match the current filter.")
+        else:
+            st.caption(f"Showing rows {page_start + 1:,}–{page_start + len(page_rows):,} of {len(matching_rows):,} matching ({len(df_records):,} total)")
+            st.dataframe(df_records.iloc[page_rows], hide_index=True)
+
+# -----------------------------------------------------------
+# PAGE 8 — BUDGET RECONCILIATION
+# -----------------------------------------------------------
+elif menu == "BUDGET RECONCILIATION":
+    st.header("⚖️ BUDGET vs ACTUAL RECONCILIATION")
+    st.markdown("---")
+
+    # Totals are kept per vendor/item/month and updated in place as entries are saved
+    reconciliation_frames = []
+    for source, output_file in [("HR", HR_OUTPUT_FILE), ("CSR", CSR_OUTPUT_FILE)]:
+        try:
+            df_source_totals = get_reconciliation_totals(source, output_file)
+        except Exception as e:
+            st.error(f"An error occurred while reading **{output_file}**: {e}")
+            continue
+        if not df_source_totals.empty:
+            reconciliation_frames.append(df_source_totals)
+
+    if not reconciliation_frames:
+        st.info("No expense entries found yet. Save entries on the **HR EXPENSES** or **HMA CSR ADMIN EXPENSES** pages to reconcile them.")
+    else:
+        df_reconciliation = build_reconciliation_report(pd.concat(reconciliation_frames))
+
+        selected_sources = st.multiselect("Source", ["HR", "CSR"], default=["HR", "CSR"], key="recon_sources")
+        df_reconciliation = df_reconciliation[df_reconciliation["Source"].isin(selected_sources)]
+
+        # --- Summary ---
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Actual to Date", f"₹{df_reconciliation['Actual'].sum():,.2f}")
+        col2.metric("Variance vs Budget", f"₹{df_reconciliation['Variance'].sum():,.2f}")
+        col3.metric("Projected Overruns", int((df_reconciliation["Projected Overrun"] > 0).sum()))
+
+        st.markdown("---")
+        st.subheader("📋 Reconciliation by Vendor and Service / Expense Type")
+
+        amount_format = st.column_config.NumberColumn(format="₹%.2f")
+        percent_format = st.column_config.NumberColumn(format="%.1f%%")
+        st.dataframe(
+            df_reconciliation,
+            hide_index=True,
+            column_config={
+                "Item": "Service / Expense Type",
+                "Annual commitment": amount_format,
+                "Budget to Date": amount_format,
+                "Actual": amount_format,
+                "Variance": amount_format,
+                "Variance %": percent_format,
+                "Burn Rate %": percent_format,
+                "Projected Annual": amount_format,
+                "Projected Overrun": amount_format,
+            }
+        )